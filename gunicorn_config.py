@@ -1,20 +1,2 @@
-import multiprocessing
-
-# Server socket
-bind = "0.0.0.0:8000"
-backlog = 2048
-
-# Worker processes
-workers = multiprocessing.cpu_count() * 2 + 1
-worker_class = "uvicorn.workers.UvicornWorker"
-worker_connections = 1000
-timeout = 120
-keepalive = 5
-
-# Logging
-accesslog = "-"
-errorlog = "-"
-loglevel = "info"
-
-# Process naming
-proc_name = "servicenow-mcp-api"
\ No newline at end of file
+# Kept for deployments that pass -c gunicorn_config.py; settings live in the package
+from mcp_server_servicenow.gunicorn_config import *  # noqa: F401,F403
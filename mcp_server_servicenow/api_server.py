@@ -4,32 +4,135 @@ This module provides HTTP REST endpoints for Microsoft Copilot Studio integratio
 """
 
 import os
-import json
-import asyncio
-from typing import Optional, Dict, Any
-from fastapi import FastAPI, HTTPException, Body
-from fastapi.responses import JSONResponse
+import sys
+import hashlib
+import importlib.util
+import logging
+import logging.handlers
+import queue
+from contextlib import asynccontextmanager
+from functools import lru_cache
+from typing import Optional, Dict, List, Any, AsyncIterator, Awaitable, Callable, Hashable, Literal, Tuple, Type, TypeVar, Union
+import httpx
+import orjson
+from typing_extensions import Annotated
+from fastapi import FastAPI, HTTPException, Depends, Query, Request
+from fastapi.responses import JSONResponse, Response, StreamingResponse
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel, Field
+import msgspec
 import uvicorn
 from dotenv import load_dotenv
 
 from mcp_server_servicenow.server import (
     ServiceNowMCP, 
+    Authentication,
     create_basic_auth, 
     create_token_auth, 
     create_oauth_auth,
     IncidentCreate,
     IncidentUpdate
 )
+from mcp_server_servicenow.cache import TTLCache
+from mcp_server_servicenow.singleflight import SingleFlight
 
 # Load environment variables
 load_dotenv()
 
+logger = logging.getLogger(__name__)
+
+def _start_log_listener() -> logging.handlers.QueueListener:
+    """
+    Route package logs through a queue so handler I/O happens off the event loop
+    
+    Returns:
+        The started listener; stop it to flush and detach
+    """
+    log_queue: "queue.Queue[logging.LogRecord]" = queue.Queue(-1)
+    stream_handler = logging.StreamHandler()
+    stream_handler.setFormatter(logging.Formatter("%(asctime)s %(levelname)s %(name)s: %(message)s"))
+    listener = logging.handlers.QueueListener(log_queue, stream_handler, respect_handler_level=True)
+    
+    package_logger = logging.getLogger("mcp_server_servicenow")
+    package_logger.setLevel(os.environ.get("LOG_LEVEL", "INFO").upper())
+    package_logger.addHandler(logging.handlers.QueueHandler(log_queue))
+    package_logger.propagate = False
+    listener.start()
+    return listener
+
+def _stop_log_listener(listener: logging.handlers.QueueListener) -> None:
+    """Flush queued log records and restore normal propagation"""
+    listener.stop()
+    package_logger = logging.getLogger("mcp_server_servicenow")
+    for handler in list(package_logger.handlers):
+        if isinstance(handler, logging.handlers.QueueHandler) and handler.queue is listener.queue:
+            package_logger.removeHandler(handler)
+    package_logger.propagate = True
+
+@lru_cache(maxsize=None)
+def _build_auth() -> Authentication:
+    """Select the authentication method from the environment (credentials are fixed at runtime)"""
+    instance_url = os.environ.get("SERVICENOW_INSTANCE_URL")
+    token = os.environ.get("SERVICENOW_TOKEN")
+    client_id = os.environ.get("SERVICENOW_CLIENT_ID")
+    client_secret = os.environ.get("SERVICENOW_CLIENT_SECRET")
+    username = os.environ.get("SERVICENOW_USERNAME")
+    password = os.environ.get("SERVICENOW_PASSWORD")
+    
+    if token:
+        return create_token_auth(token)
+    if client_id and client_secret and username and password:
+        return create_oauth_auth(client_id, client_secret, username, password, instance_url)
+    if username and password:
+        return create_basic_auth(username, password)
+    raise ValueError("Authentication credentials required")
+
+class ORJSONResponse(JSONResponse):
+    """JSON response serialized with orjson (FastAPI's own ORJSONResponse is deprecated)"""
+    
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Initialize the ServiceNow MCP server on startup and clean up on shutdown"""
+    instance_url = os.environ.get("SERVICENOW_INSTANCE_URL")
+    if not instance_url:
+        raise ValueError("SERVICENOW_INSTANCE_URL environment variable is required")
+    
+    auth = _build_auth()
+    
+    # Shared HTTP/2 connection pool for all outbound ServiceNow requests
+    pool_size = int(os.environ.get("SERVICENOW_HTTP_POOL_SIZE", 100))
+    keepalive_expiry = float(os.environ.get("SERVICENOW_HTTP_KEEPALIVE", 60))
+    http = httpx.AsyncClient(
+        base_url=instance_url,
+        http2=True,
+        limits=httpx.Limits(
+            max_connections=pool_size,
+            max_keepalive_connections=pool_size,
+            keepalive_expiry=keepalive_expiry
+        ),
+        timeout=30.0
+    )
+    
+    app.state.http = http
+    app.state.server = ServiceNowMCP(instance_url=instance_url, auth=auth, http_client=http)
+    listener = _start_log_listener()
+    logger.info("ServiceNow MCP Server initialized successfully")
+    
+    try:
+        yield
+    finally:
+        await app.state.server.close()
+        await http.aclose()
+        _stop_log_listener(listener)
+
 app = FastAPI(
     title="ServiceNow MCP API",
     description="REST API for ServiceNow MCP Server - Microsoft Copilot Studio Integration",
-    version="1.0.0"
+    version="1.0.0",
+    default_response_class=ORJSONResponse,
+    lifespan=lifespan
 )
 
 # Enable CORS for Copilot Studio
@@ -41,122 +144,234 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Global server instance (will be initialized on startup)
-server: Optional[ServiceNowMCP] = None
+def get_server(request: Request) -> ServiceNowMCP:
+    """Dependency returning the ServiceNow MCP server created by the lifespan handler"""
+    server = getattr(request.app.state, "server", None)
+    if server is None:
+        raise HTTPException(
+            status_code=500,
+            detail="Server not initialized. Check Azure Application Settings."
+        )
+    return server
+
+# Coalesces concurrent identical read requests into one ServiceNow call
+inflight = SingleFlight()
+
+# Short-lived cache of serialized read responses, keyed like inflight.
+# The cache is per process: a write clears it only in the worker that handled
+# the write, so other gunicorn workers may serve pre-write reads for up to
+# CACHE_TTL seconds. Set SERVICENOW_CACHE_TTL=0 where that matters.
+CACHE_TTL = int(os.environ.get("SERVICENOW_CACHE_TTL", 5))
+response_cache = TTLCache(maxsize=1024, ttl=CACHE_TTL)
+
+# Bumped by every write; reads that started before a write must not be cached
+_cache_generation = 0
+
+def invalidate_reads() -> None:
+    """Drop cached reads and detach in-flight ones after a write to ServiceNow"""
+    global _cache_generation
+    _cache_generation += 1
+    response_cache.clear()
+    inflight.forget()
+
+async def cached_call(key: Hashable,
+                      fn: Callable[[], Awaitable[Union[Dict[str, Any], bytes]]]) -> Tuple[bytes, Optional[str]]:
+    """
+    Serve a read from the response cache, coalescing concurrent misses
+    
+    fn may return a dict to serialize or an already-serialized JSON body.
+    
+    Returns:
+        The serialized JSON body and its ETag (None for error payloads, which aren't cacheable)
+    """
+    entry = response_cache.get(key)
+    if entry is not None:
+        return entry
+    
+    generation = _cache_generation
+    
+    async def fetch() -> Tuple[bytes, str]:
+        result = await fn()
+        body = result if isinstance(result, bytes) else orjson.dumps(result)
+        # Don't keep "not found"/error payloads, or anything a write has since invalidated
+        if isinstance(result, dict) and "error" in result:
+            return body, None
+        entry = (body, make_etag(body))
+        if generation == _cache_generation:
+            response_cache.set(key, entry)
+        return entry
+    
+    return await inflight.do(key, fetch)
+
+def make_etag(body: bytes) -> str:
+    """Compute a strong ETag for a serialized response body"""
+    return '"%s"' % hashlib.blake2b(body, digest_size=8).hexdigest()
+
+def conditional_response(request: Request, body: bytes, etag: Optional[str],
+                         cache_control: Optional[str] = None) -> Response:
+    """Build a cacheable JSON response, or a 304 if the client already has it"""
+    if etag is None:
+        # Error payloads get no validator or max-age, so clients don't cache them either
+        return Response(content=body, media_type="application/json")
+    headers = {"ETag": etag, "Cache-Control": cache_control or f"max-age={CACHE_TTL}"}
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match:
+        tags = [t.strip()[2:] if t.strip().startswith("W/") else t.strip()
+                for t in if_none_match.split(",")]
+        if etag in tags or "*" in tags:
+            return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
+
+async def ndjson_response(records: AsyncIterator[Dict[str, Any]]) -> StreamingResponse:
+    """
+    Stream records as newline-delimited JSON
+    
+    The first record is fetched before responding so upstream errors still
+    produce a proper error status instead of a truncated 200.
+    """
+    try:
+        first = await records.__anext__()
+    except StopAsyncIteration:
+        return StreamingResponse(iter(()), media_type="application/x-ndjson")
+    
+    async def lines():
+        yield orjson.dumps(first) + b"\n"
+        async for record in records:
+            yield orjson.dumps(record) + b"\n"
+    
+    return StreamingResponse(lines(), media_type="application/x-ndjson")
 
 # Request/Response Models
-class NaturalLanguageSearchRequest(BaseModel):
-    query: str = Field(..., description="Natural language search query")
+class RequestStruct(msgspec.Struct, frozen=True):
+    """Base for request bodies: immutable, unknown fields ignored, strings stripped"""
     
-class NaturalLanguageUpdateRequest(BaseModel):
-    command: str = Field(..., description="Natural language update command")
+    def __post_init__(self):
+        for name in self.__struct_fields__:
+            value = getattr(self, name)
+            if isinstance(value, str):
+                msgspec.structs.force_setattr(self, name, value.strip())
+
+# Choice fields mirror IncidentUrgency/IncidentImpact (1-3) and IncidentState (no 4 or 5)
+IncidentLevel = Annotated[int, msgspec.Meta(ge=1, le=3)]
+IncidentStateValue = Literal[1, 2, 3, 6, 7, 8]
+SysId = Annotated[str, msgspec.Meta(pattern="^[0-9a-f]{32}$")]
+
+class NaturalLanguageSearchRequest(RequestStruct):
+    query: Annotated[str, msgspec.Meta(description="Natural language search query")]
+    
+class NaturalLanguageUpdateRequest(RequestStruct):
+    command: Annotated[str, msgspec.Meta(description="Natural language update command")]
     
-class SearchRecordsRequest(BaseModel):
-    query: str = Field(..., description="Text query to search for")
-    table: str = Field(default="incident", description="Table to search in")
-    limit: int = Field(default=10, description="Maximum number of results")
+class SearchRecordsRequest(RequestStruct):
+    query: Annotated[str, msgspec.Meta(description="Text query to search for")]
+    table: Annotated[str, msgspec.Meta(description="Table to search in")] = "incident"
+    limit: Annotated[int, msgspec.Meta(ge=1, description="Maximum number of results")] = 10
     
-class GetRecordRequest(BaseModel):
-    table: str = Field(..., description="Table name")
-    sys_id: str = Field(..., description="System ID of the record")
+class GetRecordRequest(RequestStruct):
+    table: Annotated[str, msgspec.Meta(description="Table name")]
+    sys_id: Annotated[str, msgspec.Meta(description="System ID of the record")]
     
-class CreateIncidentRequest(BaseModel):
-    short_description: str = Field(..., description="Short description of the incident")
-    description: str = Field(..., description="Detailed description")
+class BatchGetRecordsRequest(RequestStruct):
+    table: Annotated[str, msgspec.Meta(description="Table name")]
+    sys_ids: Annotated[List[SysId], msgspec.Meta(min_length=1, max_length=1000,
+                                                 description="System IDs of the records")]
+    fields: Optional[List[str]] = None
+    
+class CreateIncidentRequest(RequestStruct):
+    short_description: Annotated[str, msgspec.Meta(description="Short description of the incident")]
+    description: Annotated[str, msgspec.Meta(description="Detailed description")]
     caller_id: Optional[str] = None
     category: Optional[str] = None
     subcategory: Optional[str] = None
-    urgency: Optional[int] = None
-    impact: Optional[int] = None
+    urgency: Optional[IncidentLevel] = None
+    impact: Optional[IncidentLevel] = None
     assignment_group: Optional[str] = None
     assigned_to: Optional[str] = None
     
-class UpdateIncidentRequest(BaseModel):
-    number: str = Field(..., description="Incident number (e.g., INC0010001)")
+class UpdateIncidentRequest(RequestStruct):
+    number: Annotated[str, msgspec.Meta(description="Incident number (e.g., INC0010001)")]
     short_description: Optional[str] = None
     description: Optional[str] = None
-    state: Optional[int] = None
+    state: Optional[IncidentStateValue] = None
     work_notes: Optional[str] = None
     comments: Optional[str] = None
     
-class PerformQueryRequest(BaseModel):
-    table: str = Field(..., description="Table to query")
-    query: str = Field(default="", description="ServiceNow encoded query string")
-    limit: int = Field(default=10, description="Maximum number of results")
-    offset: int = Field(default=0, description="Number of records to skip")
-    fields: Optional[list[str]] = None
+class PerformQueryRequest(RequestStruct):
+    table: Annotated[str, msgspec.Meta(description="Table to query")]
+    query: Annotated[str, msgspec.Meta(description="ServiceNow encoded query string")] = ""
+    limit: Annotated[int, msgspec.Meta(ge=1, le=1000, description="Maximum number of results")] = 10
+    offset: Annotated[int, msgspec.Meta(ge=0, description="Number of records to skip")] = 0
+    fields: Optional[List[str]] = None
 
-@app.on_event("startup")
-async def startup_event():
-    """Initialize the ServiceNow MCP server on startup"""
-    global server
-    
-    instance_url = os.environ.get("SERVICENOW_INSTANCE_URL")
-    if not instance_url:
-        raise ValueError("SERVICENOW_INSTANCE_URL environment variable is required")
+# Stream endpoints return up to STREAM_DEFAULT_LIMIT records unless a limit is
+# given, and never more than STREAM_MAX_LIMIT; there is no "whole table" mode
+STREAM_DEFAULT_LIMIT = 1000
+STREAM_MAX_LIMIT = 10000
+StreamLimit = Annotated[int, msgspec.Meta(ge=1, le=STREAM_MAX_LIMIT,
+                                          description="Maximum number of records to stream")]
+
+class StreamQueryRequest(RequestStruct):
+    table: Annotated[str, msgspec.Meta(description="Table to query")]
+    query: Annotated[str, msgspec.Meta(description="ServiceNow encoded query string")] = ""
+    limit: StreamLimit = STREAM_DEFAULT_LIMIT
+    offset: Annotated[int, msgspec.Meta(ge=0, description="Number of records to skip")] = 0
+    fields: Optional[List[str]] = None
+
+T = TypeVar("T", bound=RequestStruct)
+
+def msgspec_body(struct_type: Type[T]) -> Callable[[Request], Awaitable[T]]:
+    """Dependency decoding and validating the raw JSON request body with msgspec"""
+    # strict=False keeps the lax coercion the Pydantic models had (e.g. "20" -> 20)
+    decoder = msgspec.json.Decoder(struct_type, strict=False)
     
-    # Determine authentication method
-    auth = None
-    if os.environ.get("SERVICENOW_TOKEN"):
-        auth = create_token_auth(os.environ.get("SERVICENOW_TOKEN"))
-    elif (os.environ.get("SERVICENOW_CLIENT_ID") and 
-          os.environ.get("SERVICENOW_CLIENT_SECRET") and
-          os.environ.get("SERVICENOW_USERNAME") and
-          os.environ.get("SERVICENOW_PASSWORD")):
-        auth = create_oauth_auth(
-            os.environ.get("SERVICENOW_CLIENT_ID"),
-            os.environ.get("SERVICENOW_CLIENT_SECRET"),
-            os.environ.get("SERVICENOW_USERNAME"),
-            os.environ.get("SERVICENOW_PASSWORD"),
-            instance_url
-        )
-    elif os.environ.get("SERVICENOW_USERNAME") and os.environ.get("SERVICENOW_PASSWORD"):
-        auth = create_basic_auth(
-            os.environ.get("SERVICENOW_USERNAME"),
-            os.environ.get("SERVICENOW_PASSWORD")
-        )
-    else:
-        raise ValueError("Authentication credentials required")
+    async def decode(request: Request) -> T:
+        try:
+            return decoder.decode(await request.body())
+        except msgspec.DecodeError as e:
+            raise HTTPException(status_code=422, detail=str(e))
     
-    server = ServiceNowMCP(instance_url=instance_url, auth=auth)
-    print("ServiceNow MCP Server initialized successfully")
+    return decode
 
-@app.on_event("shutdown")
-async def shutdown_event():
-    """Clean up on shutdown"""
-    global server
-    if server:
-        await server.close()
+def msgspec_openapi(struct_type: Type[RequestStruct]) -> Dict[str, Any]:
+    """OpenAPI request body for a msgspec-decoded endpoint (flat structs only)"""
+    schema = msgspec.json.schema(struct_type)
+    return {"requestBody": {
+        "required": True,
+        "content": {"application/json": {"schema": schema["$defs"][struct_type.__name__]}},
+    }}
+
+# Static payloads are serialized once at import
+STATIC_CACHE_CONTROL = "public, max-age=60"
+_ROOT_BODY = orjson.dumps({
+    "status": "healthy",
+    "service": "ServiceNow MCP API",
+    "version": "1.0.0"
+})
+_ROOT_ETAG = make_etag(_ROOT_BODY)
+_HEALTH_BODY = orjson.dumps({"status": "healthy"})
+_HEALTH_ETAG = make_etag(_HEALTH_BODY)
 
 @app.get("/")
-async def root():
+async def root(request: Request):
     """Health check endpoint"""
-    return {
-        "status": "healthy",
-        "service": "ServiceNow MCP API",
-        "version": "1.0.0"
-    }
+    return conditional_response(request, _ROOT_BODY, _ROOT_ETAG, STATIC_CACHE_CONTROL)
 
 @app.get("/health")
-async def health():
+async def health(request: Request):
     """Health check endpoint"""
-    return {"status": "healthy"}
+    return conditional_response(request, _HEALTH_BODY, _HEALTH_ETAG, STATIC_CACHE_CONTROL)
 
-@app.post("/api/v1/search/natural-language")
-async def natural_language_search(request: NaturalLanguageSearchRequest):
+@app.post("/api/v1/search/natural-language", openapi_extra=msgspec_openapi(NaturalLanguageSearchRequest))
+async def natural_language_search(
+    request: NaturalLanguageSearchRequest = Depends(msgspec_body(NaturalLanguageSearchRequest)),
+    server: ServiceNowMCP = Depends(get_server)
+):
     """
     Search for records using natural language
     
     Example: "find all incidents about email"
     """
     try:
-        # Check if server is initialized
-        if not server:
-            raise HTTPException(
-                status_code=500, 
-                detail="Server not initialized. Check Azure Application Settings."
-            )
-        
         # Call the natural language search
         result = await server.natural_language_search(query=request.query)
         
@@ -167,45 +382,24 @@ async def natural_language_search(request: NaturalLanguageSearchRequest):
                 detail="Empty response from ServiceNow"
             )
         
-        # Parse JSON - handle both string and dict responses
-        if isinstance(result, str):
-            try:
-                result_dict = json.loads(result)
-            except json.JSONDecodeError as e:
-                # Log the actual response for debugging in Azure
-                print(f"JSON Decode Error: {str(e)}")
-                print(f"Result type: {type(result)}")
-                print(f"Result length: {len(result) if result else 0}")
-                print(f"Result preview (first 500 chars): {result[:500] if result else 'None'}")
-                raise HTTPException(
-                    status_code=500, 
-                    detail=f"Failed to parse ServiceNow response as JSON: {str(e)}"
-                )
-        elif isinstance(result, dict):
-            result_dict = result
-        else:
-            raise HTTPException(
-                status_code=500,
-                detail=f"Unexpected response type: {type(result)}"
-            )
-        
-        return JSONResponse(content=result_dict)
+        return result
         
     except HTTPException:
         # Re-raise HTTP exceptions
         raise
     except Exception as e:
         # Log full error trace for debugging in Azure
-        import traceback
-        error_trace = traceback.format_exc()
-        print(f"Error in natural_language_search: {error_trace}")
+        logger.exception("Error in natural_language_search")
         raise HTTPException(
             status_code=500, 
             detail=f"Error processing request: {str(e)}"
         )
 
-@app.post("/api/v1/update/natural-language")
-async def natural_language_update(request: NaturalLanguageUpdateRequest):
+@app.post("/api/v1/update/natural-language", openapi_extra=msgspec_openapi(NaturalLanguageUpdateRequest))
+async def natural_language_update(
+    request: NaturalLanguageUpdateRequest = Depends(msgspec_body(NaturalLanguageUpdateRequest)),
+    server: ServiceNowMCP = Depends(get_server)
+):
     """
     Update records using natural language
     
@@ -213,37 +407,67 @@ async def natural_language_update(request: NaturalLanguageUpdateRequest):
     """
     try:
         result = await server.natural_language_update(command=request.command)
-        return JSONResponse(content=json.loads(result))
+        invalidate_reads()
+        return result
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
-@app.post("/api/v1/search/records")
-async def search_records(request: SearchRecordsRequest):
+@app.post("/api/v1/search/records", openapi_extra=msgspec_openapi(SearchRecordsRequest))
+async def search_records(
+    request: SearchRecordsRequest = Depends(msgspec_body(SearchRecordsRequest)),
+    server: ServiceNowMCP = Depends(get_server)
+):
     """Search for records using text query"""
     try:
-        result = await server.search_records(
+        key = ("search_records", request.table, request.query, request.limit)
+        result = await inflight.do(key, lambda: server.search_records(
             query=request.query,
             table=request.table,
             limit=request.limit
-        )
-        return JSONResponse(content=json.loads(result))
+        ))
+        return result
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
-@app.post("/api/v1/records/get")
-async def get_record(request: GetRecordRequest):
+@app.post("/api/v1/records/get", openapi_extra=msgspec_openapi(GetRecordRequest))
+async def get_record(
+    request: GetRecordRequest = Depends(msgspec_body(GetRecordRequest)),
+    server: ServiceNowMCP = Depends(get_server)
+):
     """Get a specific record by sys_id"""
     try:
-        result = await server.get_record(
+        key = ("get_record", request.table, request.sys_id)
+        body, _ = await cached_call(key, lambda: server.get_record(
             table=request.table,
             sys_id=request.sys_id
-        )
-        return JSONResponse(content=json.loads(result))
+        ))
+        return Response(content=body, media_type="application/json")
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
-@app.post("/api/v1/incidents/create")
-async def create_incident(request: CreateIncidentRequest):
+@app.post("/api/v1/records/batch", openapi_extra=msgspec_openapi(BatchGetRecordsRequest))
+async def get_records_batch(
+    request: BatchGetRecordsRequest = Depends(msgspec_body(BatchGetRecordsRequest)),
+    server: ServiceNowMCP = Depends(get_server)
+):
+    """Get several records by sys_id in one ServiceNow round-trip"""
+    try:
+        key = ("get_records_batch", request.table, tuple(request.sys_ids),
+               tuple(request.fields or ()))
+        result = await inflight.do(key, lambda: server.get_records_batch(
+            table=request.table,
+            sys_ids=request.sys_ids,
+            fields=request.fields
+        ))
+        return result
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@app.post("/api/v1/incidents/create", openapi_extra=msgspec_openapi(CreateIncidentRequest))
+async def create_incident(
+    request: CreateIncidentRequest = Depends(msgspec_body(CreateIncidentRequest)),
+    server: ServiceNowMCP = Depends(get_server)
+):
     """Create a new incident"""
     try:
         incident_data = IncidentCreate(
@@ -258,12 +482,16 @@ async def create_incident(request: CreateIncidentRequest):
             assigned_to=request.assigned_to
         )
         result = await server.create_incident(incident=incident_data)
-        return JSONResponse(content=json.loads(result))
+        invalidate_reads()
+        return result
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
-@app.post("/api/v1/incidents/update")
-async def update_incident(request: UpdateIncidentRequest):
+@app.post("/api/v1/incidents/update", openapi_extra=msgspec_openapi(UpdateIncidentRequest))
+async def update_incident(
+    request: UpdateIncidentRequest = Depends(msgspec_body(UpdateIncidentRequest)),
+    server: ServiceNowMCP = Depends(get_server)
+):
     """Update an existing incident"""
     try:
         update_data = IncidentUpdate(
@@ -277,62 +505,121 @@ async def update_incident(request: UpdateIncidentRequest):
             number=request.number,
             updates=update_data
         )
-        return JSONResponse(content=json.loads(result))
+        invalidate_reads()
+        return result
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
-@app.post("/api/v1/query/perform")
-async def perform_query(request: PerformQueryRequest):
+@app.post("/api/v1/query/perform", openapi_extra=msgspec_openapi(PerformQueryRequest))
+async def perform_query(
+    request: PerformQueryRequest = Depends(msgspec_body(PerformQueryRequest)),
+    server: ServiceNowMCP = Depends(get_server)
+):
     """Perform a query against ServiceNow"""
     try:
-        result = await server.perform_query(
+        key = ("perform_query", request.table, request.query, request.limit,
+               request.offset, tuple(request.fields or ()))
+        # ServiceNow's JSON body is forwarded as-is rather than parsed and re-serialized
+        body = await inflight.do(key, lambda: server.perform_query_raw(
             table=request.table,
             query=request.query,
             limit=request.limit,
             offset=request.offset,
             fields=request.fields
-        )
-        return JSONResponse(content=json.loads(result))
+        ))
+        return Response(content=body, media_type="application/json")
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@app.post("/api/v1/query/stream", openapi_extra=msgspec_openapi(StreamQueryRequest))
+async def stream_query(
+    request: StreamQueryRequest = Depends(msgspec_body(StreamQueryRequest)),
+    server: ServiceNowMCP = Depends(get_server)
+):
+    """
+    Stream query results as newline-delimited JSON, one record per line
+    
+    Returns up to limit records (default STREAM_DEFAULT_LIMIT, max STREAM_MAX_LIMIT).
+    """
+    try:
+        return await ndjson_response(server.iter_query(
+            table=request.table,
+            query=request.query,
+            limit=request.limit,
+            offset=request.offset,
+            fields=request.fields
+        ))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@app.get("/api/v1/incidents/stream")
+async def stream_incidents(query: str = "",
+                           limit: int = Query(STREAM_DEFAULT_LIMIT, ge=1, le=STREAM_MAX_LIMIT),
+                           server: ServiceNowMCP = Depends(get_server)):
+    """
+    Stream incidents as newline-delimited JSON, one record per line
+    
+    Returns up to limit records (default STREAM_DEFAULT_LIMIT, max STREAM_MAX_LIMIT).
+    """
+    try:
+        return await ndjson_response(server.iter_incidents(query=query, limit=limit))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.get("/api/v1/incidents/{incident_number}")
-async def get_incident_by_number(incident_number: str):
+async def get_incident_by_number(incident_number: str, request: Request,
+                                 server: ServiceNowMCP = Depends(get_server)):
     """Get an incident by its number"""
     try:
-        result = await server.get_incident(number=incident_number)
-        return JSONResponse(content=json.loads(result))
+        key = ("get_incident", incident_number)
+        body, etag = await cached_call(key, lambda: server.get_incident(number=incident_number))
+        return conditional_response(request, body, etag)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.get("/api/v1/incidents")
-async def list_incidents():
+async def list_incidents(request: Request, server: ServiceNowMCP = Depends(get_server)):
     """List recent incidents"""
     try:
-        result = await server.list_incidents()
-        return JSONResponse(content=json.loads(result))
+        body, etag = await cached_call(("list_incidents",), server.list_incidents_raw)
+        return conditional_response(request, body, etag)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
     
     
+def _http_pool_info(client: Optional[httpx.AsyncClient]) -> Optional[Dict[str, Any]]:
+    """Summarize the shared connection pool (relies on httpx/httpcore internals)"""
+    pool = getattr(getattr(client, "_transport", None), "_pool", None)
+    if pool is None:
+        return None
+    connections = list(getattr(pool, "connections", []))
+    return {
+        "connections": len(connections),
+        "http2_connections": sum(1 for c in connections if "HTTP/2" in c.info()),
+        "idle_connections": sum(1 for c in connections if c.is_idle()),
+    }
+    
 @app.get("/api/v1/debug/info")
-async def debug_info():
+async def debug_info(request: Request):
     """Debug endpoint to check server status"""
     try:
+        server = getattr(request.app.state, "server", None)
         return {
             "server_initialized": server is not None,
             "server_client_initialized": server.client is not None if server else False,
             "instance_url": os.environ.get("SERVICENOW_INSTANCE_URL", "NOT SET"),
             "username_set": bool(os.environ.get("SERVICENOW_USERNAME")),
             "password_set": bool(os.environ.get("SERVICENOW_PASSWORD")),
+            "http_pool": _http_pool_info(getattr(request.app.state, "http", None)),
         }
     except Exception as e:
         return {"error": str(e)}
 
 @app.post("/api/v1/debug/test-query")
-async def debug_test_query():
+async def debug_test_query(request: Request):
     """Debug endpoint to test a simple query"""
     try:
+        server = getattr(request.app.state, "server", None)
         if not server:
             return {"error": "Server not initialized"}
         
@@ -342,9 +629,7 @@ async def debug_test_query():
         return {
             "success": True,
             "result_type": type(result).__name__,
-            "result_length": len(result) if result else 0,
-            "result_preview": result[:200] if result else None,
-            "is_string": isinstance(result, str),
+            "result_count": len(result.get("result", [])) if result else 0,
             "is_dict": isinstance(result, dict),
         }
     except Exception as e:
@@ -359,11 +644,26 @@ def main():
     port = int(os.environ.get("PORT", 8000))
     host = os.environ.get("HOST", "0.0.0.0")
     
+    # Each gunicorn worker runs the lifespan handler and owns its own connection pool.
+    # UvicornWorker picks up uvloop and httptools automatically when installed.
+    # Workers, bind address, timeouts etc. all come from the shared gunicorn config.
+    if sys.platform != "win32" and importlib.util.find_spec("gunicorn"):
+        os.execv(sys.executable, [
+            sys.executable, "-m", "gunicorn",
+            "--config", "python:mcp_server_servicenow.gunicorn_config",
+            "mcp_server_servicenow.api_server:app"
+        ])
+    
+    # Fallback where gunicorn is unavailable; uvloop doesn't support Windows
+    use_uvloop = sys.platform != "win32" and importlib.util.find_spec("uvloop")
     uvicorn.run(
         "mcp_server_servicenow.api_server:app",
         host=host,
         port=port,
-        reload=False
+        reload=False,
+        loop="uvloop" if use_uvloop else "asyncio",
+        http="httptools" if importlib.util.find_spec("httptools") else "h11",
+        workers=int(os.environ.get("WEB_CONCURRENCY", 1))
     )
 
 if __name__ == "__main__":
@@ -5,13 +5,21 @@ This module provides the command-line interface for the ServiceNow MCP server.
 """
 
 import argparse
+import json
 import os
+import re
 import sys
 import asyncio
 from dotenv import load_dotenv
 
 from mcp_server_servicenow.server import ServiceNowMCP, create_basic_auth
 
+# Commands that end an interactive session
+_QUIT_COMMANDS = frozenset({'quit', 'exit', 'q'})
+
+# Keywords that mark an interactive query as an update command
+_UPDATE_RE = re.compile(r"\b(?:update|set|close|change|modify)\b", re.IGNORECASE)
+
 async def interactive_mode(server: ServiceNowMCP):
     """Run the server in interactive mode, accepting natural language queries"""
     print("ServiceNow MCP Server - Interactive Mode")
@@ -25,19 +33,19 @@ async def interactive_mode(server: ServiceNowMCP):
             if not query:
                 continue
                 
-            if query.lower() in ['quit', 'exit', 'q']:
+            if query.lower() in _QUIT_COMMANDS:
                 print("Goodbye!")
                 break
             
             # Determine if it's a search or update command
-            if any(word in query.lower() for word in ['update', 'set', 'close', 'change', 'modify']):
+            if _UPDATE_RE.search(query):
                 # This looks like an update command
                 result = await server.natural_language_update(command=query)
-                print(result)
+                print(json.dumps(result, indent=2))
             else:
                 # Assume it's a search query
                 result = await server.natural_language_search(query=query)
-                print(result)
+                print(json.dumps(result, indent=2))
                 
         except KeyboardInterrupt:
             print("\n\nGoodbye!")
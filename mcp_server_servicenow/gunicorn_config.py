@@ -0,0 +1,28 @@
+"""
+Gunicorn settings for the ServiceNow MCP REST API
+
+Used by both startup.sh and api_server.main(), so all deployments run with
+the same settings. Load it with: gunicorn -c python:mcp_server_servicenow.gunicorn_config
+"""
+
+import multiprocessing
+import os
+
+# Server socket
+bind = f"{os.environ.get('HOST', '0.0.0.0')}:{os.environ.get('PORT', 8000)}"
+backlog = 2048
+
+# Worker processes
+workers = int(os.environ.get("WEB_CONCURRENCY", multiprocessing.cpu_count() * 2 + 1))
+worker_class = "uvicorn.workers.UvicornWorker"
+worker_connections = 1000
+timeout = 120
+keepalive = 5
+
+# Logging
+accesslog = "-"
+errorlog = "-"
+loglevel = "info"
+
+# Process naming
+proc_name = "servicenow-mcp-api"
@@ -12,7 +12,7 @@ import logging
 import re
 from datetime import datetime
 from enum import Enum
-from typing import Dict, List, Optional, Any, Union, Literal, Tuple
+from typing import AsyncIterator, Dict, List, Optional, Any, Union, Literal, Tuple
 
 import requests
 import httpx
@@ -25,6 +25,15 @@ from mcp.server.fastmcp.utilities.logging import get_logger
 
 logger = get_logger(__name__)
 
+# ServiceNow sys_ids are 32 lowercase hex characters
+SYS_ID_PATTERN = re.compile(r"[0-9a-f]{32}")
+
+# sys_ids per sys_idIN query, keeping each request URL well under common length limits
+BATCH_CHUNK_SIZE = 100
+
+# Body returned in place of an empty or non-JSON ServiceNow response
+EMPTY_RESULT_BODY = b'{"result":[]}'
+
 # ServiceNow API models
 class IncidentState(int, Enum):
     NEW = 1
@@ -193,19 +202,23 @@ class OAuthAuth(Authentication):
 class ServiceNowClient:
     """Client for interacting with ServiceNow API"""
     
-    def __init__(self, instance_url: str, auth: Authentication):
+    def __init__(self, instance_url: str, auth: Authentication,
+                 http_client: Optional[httpx.AsyncClient] = None):
         self.instance_url = instance_url.rstrip('/')
         self.auth = auth
-        self.client = httpx.AsyncClient()
+        # A shared client is owned (and closed) by whoever created it
+        self._owns_client = http_client is None
+        self.client = http_client if http_client is not None else httpx.AsyncClient()
         
     async def close(self):
         """Close the HTTP client"""
-        await self.client.aclose()
+        if self._owns_client:
+            await self.client.aclose()
         
-    async def request(self, method: str, path: str, 
+    async def _send(self, method: str, path: str,
                     params: Optional[Dict[str, Any]] = None,
-                    json_data: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
-        """Make a request to the ServiceNow API"""
+                    json_data: Optional[Dict[str, Any]] = None) -> httpx.Response:
+        """Send a request to the ServiceNow API and return the successful response"""
         url = f"{self.instance_url}{path}"
         headers = await self.auth.get_headers()
         headers["Accept"] = "application/json"
@@ -225,27 +238,7 @@ class ServiceNowClient:
                 auth=auth
             )
             response.raise_for_status()
-            # Check if response has content before parsing JSON
-            response_text = response.text.strip()
-            
-            
-            if not response_text:
-                logger.warning(f"Empty response body from ServiceNow: {method} {url}")
-                # Return empty result structure consistent with ServiceNow API format
-                return {"result": []}
-            
-            # Try to parse JSON
-            try:
-                return response.json()
-            except ValueError as json_err:
-                # Log the actual response for debugging
-                logger.error(f"JSON decode error from ServiceNow: {str(json_err)}")
-                logger.error(f"Response status: {response.status_code}")
-                logger.error(f"Response headers: {dict(response.headers)}")
-                logger.error(f"Response content (first 500 chars): {response_text[:500]}")
-                # Return empty result structure instead of crashing
-                return {"result": []}
-                
+            return response
         except httpx.HTTPStatusError as e:
             error_text = e.response.text if e.response else "No response text"
             logger.error(f"ServiceNow API HTTP error {e.response.status_code}: {error_text}")
@@ -253,6 +246,54 @@ class ServiceNowClient:
         except Exception as e:
             logger.error(f"Unexpected error in ServiceNow request: {str(e)}")
             raise
+        
+    async def request(self, method: str, path: str, 
+                    params: Optional[Dict[str, Any]] = None,
+                    json_data: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Make a request to the ServiceNow API"""
+        response = await self._send(method, path, params=params, json_data=json_data)
+        # Check if response has content before parsing JSON
+        content = response.content
+        
+        if not content or content.isspace():
+            logger.warning(f"Empty response body from ServiceNow: {method} {path}")
+            # Return empty result structure consistent with ServiceNow API format
+            return {"result": []}
+        
+        # Try to parse JSON
+        try:
+            return json.loads(content)
+        except ValueError as json_err:
+            # Log the actual response for debugging
+            logger.error(f"JSON decode error from ServiceNow: {str(json_err)}")
+            logger.error(f"Response status: {response.status_code}")
+            logger.error(f"Response headers: {dict(response.headers)}")
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Response content (first 500 chars): %s",
+                             content[:500].decode(errors="replace"))
+            # Return empty result structure instead of crashing
+            return {"result": []}
+            
+    async def request_raw(self, method: str, path: str,
+                          params: Optional[Dict[str, Any]] = None) -> bytes:
+        """
+        Make a request to the ServiceNow API and return the JSON body unparsed
+        
+        For callers that pass the body straight through. The body is only checked
+        for being non-empty JSON by its Content-Type, not parsed.
+        """
+        response = await self._send(method, path, params=params)
+        content = response.content
+        
+        if not content or content.isspace():
+            logger.warning(f"Empty response body from ServiceNow: {method} {path}")
+            return EMPTY_RESULT_BODY
+        
+        content_type = response.headers.get("content-type", "")
+        if "json" not in content_type:
+            logger.error(f"Non-JSON response from ServiceNow ({content_type}): {method} {path}")
+            return EMPTY_RESULT_BODY
+        return content
             
     async def get_record(self, table: str, sys_id: str) -> Dict[str, Any]:
         """Get a record by sys_id"""
@@ -267,11 +308,9 @@ class ServiceNowClient:
                 raise ValueError(f"Incident not found: {sys_id}")
         return await self.request("GET", f"/api/now/table/{table}/{sys_id}")
         
-    async def get_records(self, table: str, options: QueryOptions = None) -> Dict[str, Any]:
-        """Get records with query options"""
-        if options is None:
-            options = QueryOptions()
-            
+    @staticmethod
+    def _query_params(options: QueryOptions) -> Dict[str, Any]:
+        """Translate query options into Table API sysparm_* parameters"""
         params = {
             "sysparm_limit": options.limit,
             "sysparm_offset": options.offset
@@ -287,7 +326,19 @@ class ServiceNowClient:
             direction = "desc" if options.order_direction == "desc" else "asc"
             params["sysparm_order_by"] = f"{options.order_by}^{direction}"
             
-        return await self.request("GET", f"/api/now/table/{table}", params=params)
+        return params
+        
+    async def get_records(self, table: str, options: QueryOptions = None) -> Dict[str, Any]:
+        """Get records with query options"""
+        if options is None:
+            options = QueryOptions()
+        return await self.request("GET", f"/api/now/table/{table}", params=self._query_params(options))
+        
+    async def get_records_raw(self, table: str, options: QueryOptions = None) -> bytes:
+        """Get records with query options as the unparsed JSON response body"""
+        if options is None:
+            options = QueryOptions()
+        return await self.request_raw("GET", f"/api/now/table/{table}", params=self._query_params(options))
     
     async def create_record(self, table: str, data: Dict[str, Any]) -> Dict[str, Any]:
         """Create a new record"""
@@ -309,6 +360,25 @@ class ServiceNowClient:
             return result["result"][0]
         return None
         
+    async def iter_records(self, table: str, query: Optional[str] = None,
+                           fields: Optional[List[str]] = None, limit: Optional[int] = None,
+                           offset: int = 0, page_size: int = 100) -> AsyncIterator[Dict[str, Any]]:
+        """Yield records one at a time, fetching them page by page (all records if limit is None)"""
+        while limit is None or limit > 0:
+            page_limit = page_size if limit is None else min(page_size, limit)
+            options = QueryOptions(limit=page_limit, offset=offset, fields=fields, query=query)
+            result = await self.get_records(table, options)
+            records = result.get("result", [])
+            # ServiceNow applies ACLs after sysparm_limit, so a short page doesn't mean the
+            # last page; only an empty one does, and the offset moves by the full window
+            if not records:
+                break
+            for record in records:
+                yield record
+            offset += page_limit
+            if limit is not None:
+                limit -= len(records)
+    
     async def search(self, query: str, table: str = "incident", limit: int = 10) -> Dict[str, Any]:
         """Search for records using text query"""
         return await self.request("GET", f"/api/now/table/{table}", 
@@ -339,8 +409,9 @@ class ServiceNowMCP:
     def __init__(self, 
                 instance_url: str,
                 auth: Authentication,
-                name: str = "ServiceNow MCP"):
-        self.client = ServiceNowClient(instance_url, auth)
+                name: str = "ServiceNow MCP",
+                http_client: Optional[httpx.AsyncClient] = None):
+        self.client = ServiceNowClient(instance_url, auth, http_client=http_client)
         self.mcp = FastMCP(name, dependencies=[
             "requests",
             "httpx", 
@@ -361,6 +432,7 @@ class ServiceNowMCP:
         self.mcp.tool(name="update_incident")(self.update_incident)
         self.mcp.tool(name="search_records")(self.search_records)
         self.mcp.tool(name="get_record")(self.get_record)
+        self.mcp.tool(name="get_records_batch")(self.get_records_batch)
         self.mcp.tool(name="perform_query")(self.perform_query)
         self.mcp.tool(name="add_comment")(self.add_comment)
         self.mcp.tool(name="add_work_notes")(self.add_work_notes)
@@ -386,58 +458,62 @@ class ServiceNowMCP:
             asyncio.run(self.close())
         
     # Resource handlers
-    async def list_incidents(self) -> str:
+    async def list_incidents(self) -> Dict[str, Any]:
         """List recent incidents in ServiceNow"""
         options = QueryOptions(limit=10)
         result = await self.client.get_records("incident", options)
-        return json.dumps(result, indent=2)
+        return result
+        
+    async def list_incidents_raw(self) -> bytes:
+        """List recent incidents as the unparsed ServiceNow JSON body"""
+        return await self.client.get_records_raw("incident", QueryOptions(limit=10))
         
-    async def get_incident(self, number: str) -> str:
+    async def get_incident(self, number: str) -> Dict[str, Any]:
         """Get a specific incident by number"""
         try:
             # Always use get_incident_by_number to query by incident number, not get_record
             incident = await self.client.get_incident_by_number(number)
             if incident:
-                return json.dumps({"result": incident}, indent=2)
+                return {"result": incident}
             else:
                 logger.error(f"No incident found with number: {number}")
-                return json.dumps({"error":{"message":"No Record found","detail":"Record doesn't exist or ACL restricts the record retrieval"},"status":"failure"})
+                return {"error":{"message":"No Record found","detail":"Record doesn't exist or ACL restricts the record retrieval"},"status":"failure"}
         except Exception as e:
             logger.error(f"Error getting incident {number}: {str(e)}")
-            return json.dumps({"error":{"message":str(e),"detail":"Error occurred while retrieving the record"},"status":"failure"})
+            return {"error":{"message":str(e),"detail":"Error occurred while retrieving the record"},"status":"failure"}
         
-    async def list_users(self) -> str:
+    async def list_users(self) -> Dict[str, Any]:
         """List users in ServiceNow"""
         options = QueryOptions(limit=10)
         result = await self.client.get_records("sys_user", options)
-        return json.dumps(result, indent=2)
+        return result
         
-    async def list_knowledge(self) -> str:
+    async def list_knowledge(self) -> Dict[str, Any]:
         """List knowledge articles in ServiceNow"""
         options = QueryOptions(limit=10)
         result = await self.client.get_records("kb_knowledge", options)
-        return json.dumps(result, indent=2)
+        return result
         
-    async def get_tables(self) -> str:
+    async def get_tables(self) -> Dict[str, Any]:
         """Get a list of available tables"""
         result = await self.client.get_available_tables()
-        return json.dumps({"result": result}, indent=2)
+        return {"result": result}
         
-    async def get_table_records(self, table: str) -> str:
+    async def get_table_records(self, table: str) -> Dict[str, Any]:
         """Get records from a specific table"""
         options = QueryOptions(limit=10)
         result = await self.client.get_records(table, options)
-        return json.dumps(result, indent=2)
+        return result
         
-    async def get_table_schema(self, table: str) -> str:
+    async def get_table_schema(self, table: str) -> Dict[str, Any]:
         """Get the schema for a table"""
         result = await self.client.get_table_schema(table)
-        return json.dumps(result, indent=2)
+        return result
     
     # Tool handlers
     async def create_incident(self, 
                      incident,
-                     ctx: Context = None) -> str:
+                     ctx: Context = None) -> Dict[str, Any]:
         """
         Create a new incident in ServiceNow
         
@@ -469,7 +545,7 @@ class ServiceNowMCP:
         else:
             error_message = f"Invalid incident type: {type(incident)}. Expected IncidentCreate, dict, or str."
             logger.error(error_message)
-            return json.dumps({"error": error_message})
+            return {"error": error_message}
 
         # Validate that required fields are present
         if "short_description" not in incident_data and isinstance(incident, dict):
@@ -496,18 +572,18 @@ class ServiceNowMCP:
             if ctx:
                 await ctx.info(f"Created incident: {result['result']['number']}")
                 
-            return json.dumps(result, indent=2)
+            return result
         except Exception as e:
             error_message = f"Error creating incident: {str(e)}"
             logger.error(error_message)
             if ctx:
                 await ctx.error(error_message)
-            return json.dumps({"error": error_message})
+            return {"error": error_message}
         
     async def update_incident(self,
                      number: str,
                      updates: IncidentUpdate,
-                     ctx: Context = None) -> str:
+                     ctx: Context = None) -> Dict[str, Any]:
         """
         Update an existing incident in ServiceNow
         
@@ -529,7 +605,7 @@ class ServiceNowMCP:
             error_message = f"Incident {number} not found"
             if ctx:
                 await ctx.error(error_message)
-            return json.dumps({"error": error_message})
+            return {"error": error_message}
             
         sys_id = incident['sys_id']
         
@@ -540,13 +616,13 @@ class ServiceNowMCP:
         data = updates.dict(exclude_none=True)
         result = await self.client.update_record("incident", sys_id, data)
         
-        return json.dumps(result, indent=2)
+        return result
         
     async def search_records(self, 
                     query: str, 
                     table: str = "incident",
                     limit: int = 10,
-                    ctx: Context = None) -> str:
+                    ctx: Context = None) -> Dict[str, Any]:
         """
         Search for records in ServiceNow using text query
         
@@ -563,12 +639,12 @@ class ServiceNowMCP:
             await ctx.info(f"Searching {table} for: {query}")
             
         result = await self.client.search(query, table, limit)
-        return json.dumps(result, indent=2)
+        return result
         
     async def get_record(self,
                 table: str,
                 sys_id: str,
-                ctx: Context = None) -> str:
+                ctx: Context = None) -> Dict[str, Any]:
         """
         Get a specific record by sys_id
         
@@ -584,7 +660,59 @@ class ServiceNowMCP:
             await ctx.info(f"Getting {table} record: {sys_id}")
             
         result = await self.client.get_record(table, sys_id)
-        return json.dumps(result, indent=2)
+        return result
+        
+    async def get_records_batch(self,
+                       table: str,
+                       sys_ids: List[str],
+                       fields: Optional[List[str]] = None,
+                       ctx: Context = None) -> Dict[str, Any]:
+        """
+        Get several records by sys_id in a single ServiceNow request
+        
+        Args:
+            table: Table to query
+            sys_ids: System IDs of the records
+            fields: List of fields to return (or all fields if None)
+            ctx: Optional context object for progress reporting
+            
+        Returns:
+            JSON response containing the records found, in the order requested
+            (sys_ids must be 32-character hex strings)
+        """
+        if ctx:
+            await ctx.info(f"Getting {len(sys_ids)} {table} records")
+            
+        unique_ids = list(dict.fromkeys(sys_ids))
+        if not unique_ids:
+            return {"result": []}
+        
+        # Reject anything that could split into other ids (",") or add query clauses ("^")
+        invalid = [sys_id for sys_id in unique_ids if not SYS_ID_PATTERN.fullmatch(sys_id)]
+        if invalid:
+            error_message = f"Invalid sys_id(s): {', '.join(invalid)}"
+            if ctx:
+                await ctx.error(error_message)
+            return {"error": error_message}
+        
+        if fields and "sys_id" not in fields:
+            fields = [*fields, "sys_id"]
+            
+        # One sys_idIN query per chunk instead of a round-trip per record
+        chunks = [unique_ids[i:i + BATCH_CHUNK_SIZE]
+                  for i in range(0, len(unique_ids), BATCH_CHUNK_SIZE)]
+        pages = await asyncio.gather(*(
+            self.client.get_records(table, QueryOptions(
+                limit=len(chunk),
+                fields=fields,
+                query=f"sys_idIN{','.join(chunk)}"
+            ))
+            for chunk in chunks
+        ))
+        
+        by_id = {record.get("sys_id"): record
+                 for page in pages for record in page.get("result", [])}
+        return {"result": [by_id[sys_id] for sys_id in unique_ids if sys_id in by_id]}
         
     async def perform_query(self,
                    table: str,
@@ -592,7 +720,7 @@ class ServiceNowMCP:
                    limit: int = 10,
                    offset: int = 0,
                    fields: Optional[List[str]] = None,
-                   ctx: Context = None) -> str:
+                   ctx: Context = None) -> Dict[str, Any]:
         """
         Perform a query against ServiceNow
         
@@ -618,12 +746,59 @@ class ServiceNowMCP:
         )
         
         result = await self.client.get_records(table, options)
-        return json.dumps(result, indent=2)
+        return result
+        
+    async def perform_query_raw(self,
+                   table: str,
+                   query: str = "",
+                   limit: int = 10,
+                   offset: int = 0,
+                   fields: Optional[List[str]] = None) -> bytes:
+        """
+        Perform a query against ServiceNow without parsing the response
+        
+        Same arguments as perform_query; returns the raw JSON body so HTTP
+        endpoints can forward it without a parse and re-serialize.
+        """
+        options = QueryOptions(
+            limit=limit,
+            offset=offset,
+            fields=fields,
+            query=query
+        )
+        return await self.client.get_records_raw(table, options)
+        
+    async def iter_query(self,
+                   table: str,
+                   query: str = "",
+                   limit: Optional[int] = None,
+                   offset: int = 0,
+                   fields: Optional[List[str]] = None) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Stream the records matching a query, paging through ServiceNow
+        
+        Args:
+            table: Table to query
+            query: Encoded query string (ServiceNow syntax)
+            limit: Maximum number of records to yield (or all records if None)
+            offset: Number of records to skip
+            fields: List of fields to return (or all fields if None)
+            
+        Yields:
+            Individual records
+        """
+        async for record in self.client.iter_records(table, query=query or None, fields=fields,
+                                                     limit=limit, offset=offset):
+            yield record
+    
+    def iter_incidents(self, query: str = "", limit: Optional[int] = None) -> AsyncIterator[Dict[str, Any]]:
+        """Stream incidents matching a query, paging through ServiceNow"""
+        return self.iter_query("incident", query=query, limit=limit)
         
     async def add_comment(self,
                  number: str,
                  comment: str,
-                 ctx: Context = None) -> str:
+                 ctx: Context = None) -> Dict[str, Any]:
         """
         Add a comment to an incident (customer visible)
         
@@ -644,7 +819,7 @@ class ServiceNowMCP:
             error_message = f"Incident {number} not found"
             if ctx:
                 await ctx.error(error_message)
-            return json.dumps({"error": error_message})
+            return {"error": error_message}
             
         sys_id = incident['sys_id']
         
@@ -652,12 +827,12 @@ class ServiceNowMCP:
         update = {"comments": comment}
         result = await self.client.update_record("incident", sys_id, update)
         
-        return json.dumps(result, indent=2)
+        return result
         
     async def add_work_notes(self,
                     number: str,
                     work_notes: str,
-                    ctx: Context = None) -> str:
+                    ctx: Context = None) -> Dict[str, Any]:
         """
         Add work notes to an incident (internal)
         
@@ -678,7 +853,7 @@ class ServiceNowMCP:
             error_message = f"Incident {number} not found"
             if ctx:
                 await ctx.error(error_message)
-            return json.dumps({"error": error_message})
+            return {"error": error_message}
             
         sys_id = incident['sys_id']
         
@@ -686,12 +861,12 @@ class ServiceNowMCP:
         update = {"work_notes": work_notes}
         result = await self.client.update_record("incident", sys_id, update)
         
-        return json.dumps(result, indent=2)
+        return result
     
     # Natural language tools
     async def natural_language_search(self,
                              query: str,
-                             ctx: Context = None) -> str:
+                             ctx: Context = None) -> Dict[str, Any]:
         """
         Search for records using natural language
         
@@ -723,11 +898,11 @@ class ServiceNowMCP:
         )
         
         result = await self.client.get_records(search_params['table'], options)
-        return json.dumps(result, indent=2)
+        return result
     
     async def natural_language_update(self,
                               command: str,
-                              ctx: Context = None) -> str:
+                              ctx: Context = None) -> Dict[str, Any]:
         """
         Update a record using natural language
         
@@ -760,7 +935,7 @@ class ServiceNowMCP:
                     error_message = f"Incident {record_number} not found"
                     if ctx:
                         await ctx.error(error_message)
-                    return json.dumps({"error": error_message})
+                    return {"error": error_message}
                 
                 sys_id = incident['sys_id']
                 table = "incident"
@@ -769,21 +944,21 @@ class ServiceNowMCP:
                 error_message = f"Record type not supported: {record_number}"
                 if ctx:
                     await ctx.error(error_message)
-                return json.dumps({"error": error_message})
+                return {"error": error_message}
             
             # Update the record
             result = await self.client.update_record(table, sys_id, updates)
-            return json.dumps(result, indent=2)
+            return result
             
         except ValueError as e:
             error_message = str(e)
             if ctx:
                 await ctx.error(error_message)
-            return json.dumps({"error": error_message})
+            return {"error": error_message}
     
     async def update_script(self,
                    script_update: ScriptUpdateModel,
-                   ctx: Context = None) -> str:
+                   ctx: Context = None) -> Dict[str, Any]:
         """
         Update a ServiceNow script
         
@@ -839,7 +1014,7 @@ class ServiceNowMCP:
                 
             result = await self.client.update_record(table, sys_id, data)
             
-        return json.dumps(result, indent=2)
+        return result
     
     # Prompt templates
     def incident_analysis_prompt(self, incident_number: str) -> str:
@@ -0,0 +1,46 @@
+"""
+Request coalescing for ServiceNow reads
+
+This module lets concurrent identical requests share a single upstream call.
+"""
+
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Hashable
+
+
+class SingleFlight:
+    """Coalesce concurrent calls that share a key into one in-flight call"""
+
+    def __init__(self):
+        self._calls: Dict[Hashable, asyncio.Future] = {}
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Run fn() unless a call for key is already in flight, then await its result
+
+        Args:
+            key: Hashable identifier of the call
+            fn: Zero-argument coroutine function performing the upstream call
+
+        Returns:
+            The result of the (shared) call
+        """
+        task = self._calls.get(key)
+        if task is None:
+            task = asyncio.ensure_future(fn())
+            self._calls[key] = task
+            task.add_done_callback(lambda done: self._discard(key, done))
+        # Shield so a cancelled caller doesn't cancel the call for everyone else
+        return await asyncio.shield(task)
+
+    def forget(self) -> None:
+        """Stop new callers from joining calls that are already in flight"""
+        self._calls.clear()
+
+    def _discard(self, key: Hashable, task: asyncio.Future) -> None:
+        # Only drop the entry if it still belongs to this call (not one started after forget())
+        if self._calls.get(key) is task:
+            del self._calls[key]
+
+    def __len__(self) -> int:
+        return len(self._calls)
@@ -5,4 +5,5 @@
 pip install -r requirements.txt
 
 # Run the FastAPI application
-gunicorn mcp_server_servicenow.api_server:app --bind 0.0.0.0:8000 --workers 4 --worker-class uvicorn.workers.UvicornWorker --timeout 120
\ No newline at end of file
+# Worker count defaults to 2 * CPU cores + 1; override with WEB_CONCURRENCY
+gunicorn mcp_server_servicenow.api_server:app -c python:mcp_server_servicenow.gunicorn_config
\ No newline at end of file
@@ -0,0 +1,294 @@
+"""
+Tests for the REST API server module
+"""
+
+import asyncio
+
+import hpack
+import httpcore
+import httpx
+import hyperframe.frame
+import pytest
+from fastapi.testclient import TestClient
+
+from mcp_server_servicenow import api_server
+from mcp_server_servicenow.server import BasicAuth, TokenAuth
+
+
+class FakeServiceNowMCP:
+    """Stand-in for ServiceNowMCP that returns canned ServiceNow payloads"""
+
+    def __init__(self):
+        self.client = None
+        self.calls = []
+
+    async def perform_query_raw(self, table, query="", limit=10, offset=0, fields=None):
+        self.calls.append(("perform_query", table, query, limit, offset, fields))
+        return b'{"result":[{"number":"INC0010001","table":"%s"}]}' % table.encode()
+
+    async def search_records(self, query, table="incident", limit=10):
+        self.calls.append(("search_records", query, table, limit))
+        return {"result": []}
+
+    async def get_incident(self, number):
+        self.calls.append(("get_incident", number))
+        if number == "INC0000000":
+            return {"error": {"message": "No Record found"}, "status": "failure"}
+        return {"result": {"number": number}}
+
+    async def list_incidents_raw(self):
+        self.calls.append(("list_incidents",))
+        return b'{"result":[{"number":"INC0010001"},{"number":"INC0010002"}]}'
+
+    async def iter_incidents(self, query="", limit=None):
+        self.calls.append(("iter_incidents", query, limit))
+        for number in ("INC0010001", "INC0010002"):
+            yield {"number": number}
+
+    async def close(self):
+        pass
+
+
+@pytest.fixture
+def fake_server(monkeypatch):
+    fake = FakeServiceNowMCP()
+    monkeypatch.setattr(api_server.app.state, "server", fake, raising=False)
+    api_server.response_cache.clear()
+    return fake
+
+
+@pytest.fixture
+def client(fake_server):
+    return TestClient(api_server.app)
+
+
+class TestApiServer:
+    """Test cases for the REST API endpoints"""
+
+    def test_perform_query_passes_body_through(self, client, fake_server):
+        """Test that the raw ServiceNow body is passed through as the response body"""
+        response = client.post("/api/v1/query/perform", json={"table": "incident", "query": "active=true"})
+        assert response.status_code == 200
+        assert response.json() == {"result": [{"number": "INC0010001", "table": "incident"}]}
+        assert fake_server.calls == [("perform_query", "incident", "active=true", 10, 0, None)]
+
+    def test_get_incident_by_number(self, client):
+        """Test fetching a single incident"""
+        response = client.get("/api/v1/incidents/INC0010001")
+        assert response.status_code == 200
+        assert response.json() == {"result": {"number": "INC0010001"}}
+
+    def test_list_incidents(self, client):
+        """Test listing recent incidents"""
+        response = client.get("/api/v1/incidents")
+        assert response.status_code == 200
+        assert len(response.json()["result"]) == 2
+
+    def test_debug_info_reports_http_pool(self, client, monkeypatch):
+        """Test that the debug endpoint summarizes the shared connection pool"""
+        # An HTTP/2 exchange over httpcore's mock network, leaving one idle connection in the pool
+        backend = httpcore.AsyncMockBackend([
+            hyperframe.frame.SettingsFrame().serialize(),
+            hyperframe.frame.HeadersFrame(1, data=hpack.Encoder().encode([(b":status", b"200")]),
+                                          flags=["END_HEADERS"]).serialize(),
+            hyperframe.frame.DataFrame(1, data=b"{}", flags=["END_STREAM"]).serialize(),
+        ], http2=True)
+        http = httpx.AsyncClient(http2=True)
+        http._transport._pool = httpcore.AsyncConnectionPool(http2=True, network_backend=backend)
+        monkeypatch.setattr(api_server.app.state, "http", http, raising=False)
+        try:
+            asyncio.run(http.get("https://example.service-now.com/"))
+            response = client.get("/api/v1/debug/info")
+        finally:
+            asyncio.run(http.aclose())
+        assert response.status_code == 200
+        assert response.json()["http_pool"] == {
+            "connections": 1,
+            "http2_connections": 1,
+            "idle_connections": 1,
+        }
+
+    def test_list_incidents_is_cached(self, client, fake_server):
+        """Test that repeated reads are served from the response cache"""
+        first = client.get("/api/v1/incidents")
+        second = client.get("/api/v1/incidents")
+        assert first.json() == second.json()
+        assert fake_server.calls == [("list_incidents",)]
+        assert second.headers["Cache-Control"] == f"max-age={api_server.CACHE_TTL}"
+
+    def test_get_incident_honors_if_none_match(self, client):
+        """Test that a matching ETag returns 304 without a body"""
+        first = client.get("/api/v1/incidents/INC0010001")
+        etag = first.headers["ETag"]
+        second = client.get("/api/v1/incidents/INC0010001", headers={"If-None-Match": etag})
+        assert second.status_code == 304
+        assert second.content == b""
+        third = client.get("/api/v1/incidents/INC0010001", headers={"If-None-Match": '"stale"'})
+        assert third.status_code == 200
+
+    def test_error_payloads_are_not_cacheable(self, client, fake_server):
+        """Test that "not found" payloads carry no ETag or max-age and aren't cached"""
+        for _ in range(2):
+            response = client.get("/api/v1/incidents/INC0000000")
+            assert response.json()["status"] == "failure"
+            assert "ETag" not in response.headers
+            assert "Cache-Control" not in response.headers
+        assert fake_server.calls == [("get_incident", "INC0000000")] * 2
+
+    def test_stream_incidents_returns_ndjson(self, client, fake_server):
+        """Test that the streaming endpoint emits one JSON record per line"""
+        response = client.get("/api/v1/incidents/stream", params={"limit": 2})
+        assert response.status_code == 200
+        assert response.headers["content-type"] == "application/x-ndjson"
+        assert response.text.splitlines() == ['{"number":"INC0010001"}', '{"number":"INC0010002"}']
+        assert fake_server.calls == [("iter_incidents", "", 2)]
+
+    def test_stream_limits_are_bounded(self, client, fake_server):
+        """Test that streams default to a bounded limit and reject bad limits"""
+        assert client.get("/api/v1/incidents/stream").status_code == 200
+        assert fake_server.calls == [("iter_incidents", "", api_server.STREAM_DEFAULT_LIMIT)]
+        for limit in (0, -1, api_server.STREAM_MAX_LIMIT + 1):
+            assert client.get("/api/v1/incidents/stream", params={"limit": limit}).status_code == 422
+        response = client.post("/api/v1/query/stream",
+                               json={"table": "incident", "limit": api_server.STREAM_MAX_LIMIT + 1})
+        assert response.status_code == 422
+
+    def test_health_supports_conditional_requests(self, client):
+        """Test that static endpoints return an ETag and honor If-None-Match"""
+        response = client.get("/health")
+        assert response.json() == {"status": "healthy"}
+        assert response.headers["Cache-Control"] == "public, max-age=60"
+        etag = response.headers["ETag"]
+        response = client.get("/health", headers={"If-None-Match": f"W/{etag}"})
+        assert response.status_code == 304
+
+    def test_incident_choice_fields_are_range_checked(self, client):
+        """Test that out-of-range urgency values are rejected before reaching ServiceNow"""
+        response = client.post("/api/v1/incidents/create", json={
+            "short_description": "Email down",
+            "description": "Nobody can send email",
+            "urgency": 9,
+        })
+        assert response.status_code == 422
+
+    def test_incident_state_must_be_a_known_state(self, client):
+        """Test that states inside 1-8 but missing from IncidentState are rejected"""
+        for state in (4, 5, 9):
+            response = client.post("/api/v1/incidents/update", json={"number": "INC0010001", "state": state})
+            assert response.status_code == 422
+
+    def test_malformed_body_returns_422(self, client, fake_server):
+        """Test that invalid JSON and missing required fields are rejected"""
+        response = client.post("/api/v1/query/perform", content=b"{not json",
+                               headers={"Content-Type": "application/json"})
+        assert response.status_code == 422
+        response = client.post("/api/v1/query/perform", json={"query": "active=true"})
+        assert response.status_code == 422
+        assert "table" in response.json()["detail"]
+        assert fake_server.calls == []
+
+    def test_numeric_strings_are_coerced(self, client, fake_server):
+        """Test that numeric strings are accepted as they were with Pydantic"""
+        response = client.post("/api/v1/query/perform",
+                               json={"table": "incident", "limit": "20", "offset": "5"})
+        assert response.status_code == 200
+        assert fake_server.calls == [("perform_query", "incident", "", 20, 5, None)]
+
+    def test_paging_parameters_are_range_checked(self, client, fake_server):
+        """Test that bad limit/offset values are a 422, not an upstream 500"""
+        for body in ({"table": "incident", "limit": -5}, {"table": "incident", "limit": 1001},
+                     {"table": "incident", "offset": -1}):
+            assert client.post("/api/v1/query/perform", json=body).status_code == 422
+        assert fake_server.calls == []
+
+    def test_search_limit_is_not_capped(self, client, fake_server):
+        """Test that search keeps accepting limits above the query cap, but not below 1"""
+        response = client.post("/api/v1/search/records", json={"query": "email", "limit": 1500})
+        assert response.status_code == 200
+        assert fake_server.calls == [("search_records", "email", "incident", 1500)]
+        response = client.post("/api/v1/search/records", json={"query": "email", "limit": 0})
+        assert response.status_code == 422
+
+    def test_batch_rejects_malformed_sys_ids(self, client):
+        """Test that batch sys_ids must be 32-character hex strings"""
+        response = client.post("/api/v1/records/batch",
+                               json={"table": "incident", "sys_ids": ["a" * 32, "abc,def"]})
+        assert response.status_code == 422
+
+    def test_request_strings_are_stripped(self, client, fake_server):
+        """Test that surrounding whitespace is stripped and unknown fields ignored"""
+        response = client.post("/api/v1/query/perform",
+                               json={"table": " incident ", "query": "active=true", "unknown": 1})
+        assert response.status_code == 200
+        assert fake_server.calls == [("perform_query", "incident", "active=true", 10, 0, None)]
+
+    def test_uninitialized_server_returns_500(self, monkeypatch):
+        """Test that requests fail cleanly when the lifespan handler hasn't run"""
+        monkeypatch.delattr(api_server.app.state, "server", raising=False)
+        response = TestClient(api_server.app).get("/api/v1/incidents")
+        assert response.status_code == 500
+        assert "not initialized" in response.json()["detail"]
+
+    def test_write_invalidates_reads_in_flight(self):
+        """Test that a read started before a write is neither cached nor joined afterwards"""
+        async def run():
+            release = asyncio.Event()
+            calls = []
+
+            async def old_read():
+                calls.append("old")
+                await release.wait()
+                return {"result": "old"}
+
+            async def new_read():
+                calls.append("new")
+                return {"result": "new"}
+
+            pending = asyncio.ensure_future(api_server.cached_call(("list_incidents",), old_read))
+            await asyncio.sleep(0)
+            api_server.invalidate_reads()
+            fresh, _ = await api_server.cached_call(("list_incidents",), new_read)
+            release.set()
+            stale, _ = await pending
+            after, _ = await api_server.cached_call(("list_incidents",), new_read)
+            return fresh, stale, after, calls
+
+        api_server.response_cache.clear()
+        fresh, stale, after, calls = asyncio.run(run())
+        assert fresh == b'{"result":"new"}'
+        assert stale == b'{"result":"old"}'
+        assert after == b'{"result":"new"}'
+        assert calls == ["old", "new"]
+
+
+class TestBuildAuth:
+    """Test cases for selecting the authentication method from the environment"""
+
+    @pytest.fixture(autouse=True)
+    def clean_env(self, monkeypatch):
+        for name in ("SERVICENOW_TOKEN", "SERVICENOW_CLIENT_ID", "SERVICENOW_CLIENT_SECRET",
+                     "SERVICENOW_USERNAME", "SERVICENOW_PASSWORD"):
+            monkeypatch.delenv(name, raising=False)
+        api_server._build_auth.cache_clear()
+        yield
+        api_server._build_auth.cache_clear()
+
+    def test_token_takes_precedence(self, monkeypatch):
+        """Test that a token wins over username/password"""
+        monkeypatch.setenv("SERVICENOW_TOKEN", "abc")
+        monkeypatch.setenv("SERVICENOW_USERNAME", "admin")
+        monkeypatch.setenv("SERVICENOW_PASSWORD", "secret")
+        assert isinstance(api_server._build_auth(), TokenAuth)
+
+    def test_auth_is_built_once(self, monkeypatch):
+        """Test that the auth object is reused across calls"""
+        monkeypatch.setenv("SERVICENOW_USERNAME", "admin")
+        monkeypatch.setenv("SERVICENOW_PASSWORD", "secret")
+        auth = api_server._build_auth()
+        assert isinstance(auth, BasicAuth)
+        assert api_server._build_auth() is auth
+
+    def test_missing_credentials(self):
+        """Test that missing credentials raise an error"""
+        with pytest.raises(ValueError):
+            api_server._build_auth()
@@ -0,0 +1,38 @@
+"""
+Tests for the response cache module
+"""
+
+from mcp_server_servicenow import cache
+from mcp_server_servicenow.cache import TTLCache
+
+
+class TestTTLCache:
+    """Test cases for the TTLCache class"""
+
+    def test_entries_expire(self, monkeypatch):
+        """Test that entries are dropped once their TTL has passed"""
+        now = [100.0]
+        monkeypatch.setattr(cache.time, "monotonic", lambda: now[0])
+        ttl_cache = TTLCache(ttl=5)
+        ttl_cache.set("key", "value")
+        assert ttl_cache.get("key") == "value"
+        now[0] += 5
+        assert ttl_cache.get("key") is None
+        assert len(ttl_cache) == 0
+
+    def test_least_recently_used_is_evicted(self):
+        """Test that the cache stays within maxsize"""
+        ttl_cache = TTLCache(maxsize=2, ttl=60)
+        ttl_cache.set("a", 1)
+        ttl_cache.set("b", 2)
+        ttl_cache.get("a")
+        ttl_cache.set("c", 3)
+        assert ttl_cache.get("a") == 1
+        assert ttl_cache.get("b") is None
+        assert ttl_cache.get("c") == 3
+
+    def test_zero_ttl_disables_caching(self):
+        """Test that a TTL of zero turns the cache off"""
+        ttl_cache = TTLCache(ttl=0)
+        ttl_cache.set("key", "value")
+        assert ttl_cache.get("key") is None
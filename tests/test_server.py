@@ -0,0 +1,172 @@
+"""
+Tests for the ServiceNow client and MCP server module
+"""
+
+import asyncio
+
+import httpx
+import pytest
+
+from mcp_server_servicenow.server import (
+    EMPTY_RESULT_BODY,
+    QueryOptions,
+    ServiceNowClient,
+    ServiceNowMCP,
+    create_basic_auth,
+)
+
+INSTANCE_URL = "https://example.service-now.com"
+
+
+def run_against(handler, use, server_class=ServiceNowClient):
+    """Run use(server) on a server_class instance whose HTTP requests are answered by handler"""
+    async def run():
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as shared:
+            return await use(server_class(INSTANCE_URL, create_basic_auth("u", "p"), http_client=shared))
+
+    return asyncio.run(run())
+
+
+class TestServiceNowClient:
+    """Test cases for the ServiceNowClient class"""
+
+    def test_shared_http_client_is_not_closed(self):
+        """Test that an injected HTTP client is left open for its owner"""
+        async def run():
+            shared = httpx.AsyncClient()
+            client = ServiceNowClient(INSTANCE_URL, create_basic_auth("u", "p"), http_client=shared)
+            assert client.client is shared
+            await client.close()
+            assert not shared.is_closed
+            await shared.aclose()
+
+        asyncio.run(run())
+
+    def test_own_http_client_is_closed(self):
+        """Test that a client created internally is closed with the ServiceNowClient"""
+        async def run():
+            client = ServiceNowClient(INSTANCE_URL, create_basic_auth("u", "p"))
+            await client.close()
+            assert client.client.is_closed
+
+        asyncio.run(run())
+
+    def test_request_parses_json_body(self):
+        """Test that the raw response bytes are parsed as JSON"""
+        records = [{"number": f"INC{i:07d}"} for i in range(3)]
+
+        result = run_against(lambda request: httpx.Response(200, json={"result": records}),
+                             lambda client: client.request("GET", "/api/now/table/incident"))
+        assert result == {"result": records}
+
+    def test_request_handles_empty_response(self):
+        """Test that a blank body is mapped to an empty result"""
+        result = run_against(lambda request: httpx.Response(200, content=b"  \n"),
+                             lambda client: client.request("GET", "/api/now/table/incident"))
+        assert result == {"result": []}
+
+    def test_get_records_raw_returns_body_unparsed(self):
+        """Test that raw reads return ServiceNow's bytes, and an empty result for non-JSON bodies"""
+        body = b'{"result": [{"number": "INC0000001"}]}'
+
+        def handler(request):
+            if request.url.params["sysparm_query"] == "html":
+                return httpx.Response(200, content=b"<html>login</html>", headers={"Content-Type": "text/html"})
+            return httpx.Response(200, content=body, headers={"Content-Type": "application/json"})
+
+        async def use(client):
+            return (await client.get_records_raw("incident", QueryOptions(query="active=true")),
+                    await client.get_records_raw("incident", QueryOptions(query="html")))
+
+        assert run_against(handler, use) == (body, EMPTY_RESULT_BODY)
+
+    def test_iter_records_pages_through_results(self):
+        """Test that iter_records follows sysparm_offset until an empty page"""
+        records = [{"number": f"INC{i:07d}"} for i in range(250)]
+        pages = []
+
+        def handler(request):
+            limit = int(request.url.params["sysparm_limit"])
+            offset = int(request.url.params["sysparm_offset"])
+            pages.append((offset, limit))
+            return httpx.Response(200, json={"result": records[offset:offset + limit]})
+
+        async def use(client):
+            everything = [r async for r in client.iter_records("incident")]
+            limited = [r async for r in client.iter_records("incident", limit=120, offset=10)]
+            return everything, limited
+
+        everything, limited = run_against(handler, use)
+        assert everything == records
+        assert limited == records[10:130]
+        assert pages == [(0, 100), (100, 100), (200, 100), (300, 100), (10, 100), (110, 20)]
+
+    def test_iter_records_continues_past_short_pages(self):
+        """Test that a page shortened by ACLs doesn't end the stream early"""
+        # Every third record is hidden by an ACL, so pages come back short
+        records = [{"number": f"INC{i:07d}"} for i in range(250)]
+        visible = [r for i, r in enumerate(records) if i % 3]
+
+        def handler(request):
+            limit = int(request.url.params["sysparm_limit"])
+            offset = int(request.url.params["sysparm_offset"])
+            window = range(offset, min(offset + limit, len(records)))
+            return httpx.Response(200, json={"result": [records[i] for i in window if i % 3]})
+
+        async def use(client):
+            everything = [r async for r in client.iter_records("incident")]
+            limited = [r async for r in client.iter_records("incident", limit=150)]
+            return everything, limited
+
+        everything, limited = run_against(handler, use)
+        assert everything == visible
+        assert limited == visible[:150]
+
+
+class TestServiceNowMCP:
+    """Test cases for the ServiceNowMCP class"""
+
+    def test_get_records_batch_uses_one_query(self):
+        """Test that a batch of sys_ids is fetched with a single sys_idIN query"""
+        a, b, missing = "a" * 32, "b" * 32, "c" * 32
+        requests = []
+
+        def handler(request):
+            requests.append(request)
+            return httpx.Response(200, json={"result": [
+                {"sys_id": b, "number": "INC0000002"},
+                {"sys_id": a, "number": "INC0000001"},
+            ]})
+
+        result = run_against(handler, lambda mcp_server: mcp_server.get_records_batch(
+            "incident", [a, b, a, missing], fields=["number"]), ServiceNowMCP)
+        assert [r["sys_id"] for r in result["result"]] == [a, b]
+        assert len(requests) == 1
+        params = requests[0].url.params
+        assert params["sysparm_query"] == f"sys_idIN{a},{b},{missing}"
+        assert params["sysparm_fields"] == "number,sys_id"
+        assert params["sysparm_limit"] == "3"
+
+    def test_get_records_batch_chunks_large_batches(self):
+        """Test that large batches are split into several sys_idIN queries"""
+        sys_ids = [f"{i:032x}" for i in range(250)]
+        chunks = []
+
+        def handler(request):
+            ids = request.url.params["sysparm_query"][len("sys_idIN"):].split(",")
+            chunks.append(len(ids))
+            return httpx.Response(200, json={"result": [{"sys_id": i} for i in ids]})
+
+        result = run_against(handler, lambda mcp_server: mcp_server.get_records_batch("incident", sys_ids),
+                             ServiceNowMCP)
+        assert [r["sys_id"] for r in result["result"]] == sys_ids
+        assert sorted(chunks) == [50, 100, 100]
+
+    def test_get_records_batch_rejects_invalid_ids(self):
+        """Test that ids which could alter the encoded query are rejected"""
+        result = run_against(lambda request: pytest.fail("unexpected request"),
+                             lambda mcp_server: mcp_server.get_records_batch(
+                                 "incident", ["a" * 32, "x,y", "z^active=true"]),
+                             ServiceNowMCP)
+        assert "x,y" in result["error"]
+        assert "z^active=true" in result["error"]
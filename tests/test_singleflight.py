@@ -0,0 +1,67 @@
+"""
+Tests for the request coalescing module
+"""
+
+import asyncio
+
+import pytest
+
+from mcp_server_servicenow.singleflight import SingleFlight
+
+
+class TestSingleFlight:
+    """Test cases for the SingleFlight class"""
+
+    def test_concurrent_calls_are_coalesced(self):
+        """Test that identical concurrent calls share one upstream call"""
+        calls = []
+
+        async def fetch():
+            calls.append(1)
+            await asyncio.sleep(0.01)
+            return {"result": []}
+
+        async def run():
+            group = SingleFlight()
+            results = await asyncio.gather(*(group.do("key", fetch) for _ in range(5)))
+            assert len(group) == 0
+            return results
+
+        results = asyncio.run(run())
+        assert len(calls) == 1
+        assert all(r == {"result": []} for r in results)
+
+    def test_different_keys_are_not_coalesced(self):
+        """Test that calls with different keys run independently"""
+        calls = []
+
+        async def fetch():
+            calls.append(1)
+            await asyncio.sleep(0.01)
+
+        async def run():
+            group = SingleFlight()
+            await asyncio.gather(group.do("a", fetch), group.do("b", fetch))
+
+        asyncio.run(run())
+        assert len(calls) == 2
+
+    def test_errors_are_shared_and_not_cached(self):
+        """Test that a failure reaches every waiter and the next call retries"""
+        calls = []
+
+        async def fail():
+            calls.append(1)
+            await asyncio.sleep(0.01)
+            raise ValueError("upstream error")
+
+        async def run():
+            group = SingleFlight()
+            results = await asyncio.gather(group.do("key", fail), group.do("key", fail),
+                                           return_exceptions=True)
+            assert all(isinstance(r, ValueError) for r in results)
+            with pytest.raises(ValueError):
+                await group.do("key", fail)
+
+        asyncio.run(run())
+        assert len(calls) == 2